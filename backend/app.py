@@ -1,12 +1,25 @@
 import os
-import json
-import requests
+import asyncio
+import hashlib
+import math
+import random
+import re
 import time
-from fastapi import FastAPI, HTTPException
+import uuid
+import feedparser
+import httpx
+import numpy as np
+import orjson
+import redis.asyncio as redis
+from collections import deque
+from contextlib import asynccontextmanager
+from cachetools import TTLCache
+from fastapi import BackgroundTasks, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from gnews import GNews
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 from dotenv import load_dotenv
 
@@ -17,12 +30,53 @@ load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 NEWSDATA_API_KEY = os.getenv("NEWSDATA_API_KEY")
 GOOGLE_FACT_CHECK_KEY = os.getenv("GOOGLE_FACT_CHECK_KEY")
+# Backends without a key are skipped entirely rather than checked per call
+_GOOGLE_FC_ENABLED = bool(GOOGLE_FACT_CHECK_KEY)
+_NEWSDATA_ENABLED = bool(NEWSDATA_API_KEY)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "15"))  # Gemini requests per minute quota
+GEMINI_MAX_WAIT = 5  # seconds a request may wait for Gemini capacity before we answer 429
+FACT_CHECK_CONCURRENCY = int(os.getenv("FACT_CHECK_CONCURRENCY", "5"))  # max in-flight Google Fact Check calls
+WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))   # Uvicorn worker processes sharing that quota
+
+# Cache TTLs (seconds)
+CACHE_TTL_SHORT = 60        # trending feed
+CACHE_TTL_NEWS = 90         # in-process Google News top-stories cache
+CACHE_TTL_LONG = 3600       # fact-check verdicts (may be updated upstream)
+CACHE_TTL_NEGATIVE = 86400  # "UNCHECKED" results, which rarely change
+CACHE_TTL_STALE = 7 * 86400 # last known verdict, served when upstream fails
+CACHE_TTL_JOB = 3600        # background fact-check jobs, kept for polling
+
+# Semantic cache for AI analyses - near-duplicate claims reuse a previous analysis
+SEMANTIC_CACHE_THRESHOLD = 0.92  # minimum cosine similarity for a hit
+SEMANTIC_CACHE_SIZE = 512
+CACHED_ANALYSIS_FIELDS = ("claim", "verdict", "analysis", "supporting_articles", "articles_count")
+SEMANTIC_CACHE_TTL = 3600        # news moves on; don't reuse analyses of a developing story for long
+
+# Trending headlines whose word sets overlap at least this much (Jaccard) share one fact-check
+NEAR_DUPLICATE_THRESHOLD = 0.8
 
 if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY environment variable not found.")
 
+# Upstream endpoints and the static part of their query params
+FACT_CHECK_URL = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+FACT_CHECK_BASE_PARAMS = {'languageCode': 'en', 'key': GOOGLE_FACT_CHECK_KEY, 'pageSize': 1}
+GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss"
+NEWSDATA_URL = "https://newsdata.io/api/1/latest"
+NEWSDATA_BASE_PARAMS = {'apikey': NEWSDATA_API_KEY, 'language': 'en', 'size': 5}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients on startup and close them on shutdown"""
+    # Shared async HTTP client so upstream calls reuse pooled keep-alive connections
+    app.state.http = httpx.AsyncClient(timeout=10, limits=httpx.Limits(max_keepalive_connections=64))
+    yield
+    await app.state.http.aclose()
+    await cache.aclose()
+
 # Initialize FastAPI app
-app = FastAPI(title="Project Clarion API")
+app = FastAPI(title="Project Clarion API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -31,56 +85,333 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
+# Response cache - the app keeps working (uncached) if Redis is unreachable
+cache = redis.Redis.from_url(REDIS_URL, decode_responses=True, socket_timeout=0.5, socket_connect_timeout=0.5)
+
 # Initialize Gemini Client
 client = genai.Client(api_key=GEMINI_API_KEY)
 MODEL_NAME = "gemini-2.0-flash-exp"  # Using experimental model - it's available and works
+EMBEDDING_MODEL = "gemini-embedding-001"
+
+FACT_CHECK_SYSTEM_PROMPT = """You are a professional fact-checker. Analyze the given claim and supporting articles.
+            Provide a verdict (VERIFIED, FALSE, MISLEADING, or NEEDS_REVIEW) and a detailed explanation.
+            Base your analysis only on the provided articles. Be objective and cite sources."""
 
 # --- MODELS ---
 class FactCheckRequest(BaseModel):
     claim: str
 
+class UpstreamRateLimited(Exception):
+    """An upstream API (Gemini, NewsData) is rate-limiting us"""
+
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(f"{service} rate limit reached")
+        self.service = service
+        self.retry_after = retry_after
+
+# --- RATE LIMITING ---
+class AdaptiveRateLimiter:
+    """Token bucket for an upstream per-minute quota, tuned with AIMD: the refill
+    rate is cut multiplicatively on a rate-limit response and recovers additively
+    on success. The bucket holds a minute's budget, so bursts within quota don't wait"""
+
+    def __init__(self, service: str, rate_per_minute: float, max_wait: float, min_rate_per_minute: float = 1.0):
+        self.service = service
+        self.max_wait = max_wait
+        self.max_rate = rate_per_minute
+        self.min_rate = min(min_rate_per_minute, rate_per_minute)
+        self.rate = rate_per_minute
+        self._tokens = self.capacity
+        self._updated = None  # loop time of the last refill
+        self._waiting = 0     # callers currently in acquire()
+        self._last_cut = None # monotonic time of the last rate cut
+
+    @property
+    def capacity(self):
+        # At least one token, otherwise a sub-1 rpm budget could never make a call
+        return max(1.0, self.rate)
+
+    def _refill(self, now: float):
+        if self._updated is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / 60)
+        self._updated = now
+
+    async def acquire(self):
+        """Take a token, waiting for the bucket to refill if it is empty. Raises
+        UpstreamRateLimited instead of waiting longer than max_wait"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        self._waiting += 1
+        try:
+            while True:
+                now = loop.time()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                # Callers already waiting get the next tokens, so count them in the expected wait
+                expected_wait = (self._waiting - self._tokens) * 60 / self.rate
+                if now + expected_wait > deadline:
+                    raise UpstreamRateLimited(self.service, expected_wait)
+                # Only take the token after waking, so a cancelled waiter doesn't use one up
+                await asyncio.sleep((1 - self._tokens) * 60 / self.rate)
+        finally:
+            self._waiting -= 1
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + 1)
+
+    def on_rate_limited(self):
+        # Cut once per congestion window; the other 429s of the same burst (and their retries) don't count again
+        now = time.monotonic()
+        if self._last_cut is not None and now - self._last_cut < 60 / self.rate:
+            return
+        self._last_cut = now
+        self.rate = max(self.min_rate, self.rate / 1.5)
+        self._tokens = min(self._tokens, self.capacity)
+
+# Each worker process paces its own share of the quota
+gemini_limiter = AdaptiveRateLimiter("Gemini", GEMINI_RPM / WORKERS, GEMINI_MAX_WAIT)
+
+class AdaptiveConcurrencyLimiter:
+    """Caps in-flight calls to an upstream; the cap is halved on a rate-limit
+    response and grows back by one on each success (AIMD)"""
+
+    def __init__(self, limit: int, min_limit: int = 1):
+        self.max_limit = limit
+        self.min_limit = min(min_limit, limit)
+        self.limit = limit
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        self.limit = min(self.max_limit, self.limit + 1)
+
+    def on_rate_limited(self):
+        self.limit = max(self.min_limit, self.limit // 2)
+
+fact_check_limiter = AdaptiveConcurrencyLimiter(FACT_CHECK_CONCURRENCY)
+
+# --- SEMANTIC CACHE ---
+class SemanticCache:
+    """In-process cache keyed by claim embedding; a lookup hits when a stored,
+    unexpired claim's cosine similarity is at or above the threshold"""
+
+    def __init__(self, threshold: float, maxsize: int, ttl: float):
+        self.threshold = threshold
+        self.ttl = ttl
+        self._entries = deque(maxlen=maxsize)  # (unit vector, value, expires_at), oldest first
+
+    def get(self, vector):
+        # Entries share one TTL and are appended in order, so expired ones are at the front
+        now = time.monotonic()
+        while self._entries and self._entries[0][2] <= now:
+            self._entries.popleft()
+        if not self._entries:
+            return None
+        scores = np.stack([v for v, _, _ in self._entries]) @ vector
+        best = int(np.argmax(scores))
+        return self._entries[best][1] if scores[best] >= self.threshold else None
+
+    def set(self, vector, value):
+        self._entries.append((vector, value, time.monotonic() + self.ttl))
+
+analysis_cache = SemanticCache(SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_TTL)
+
+# In-flight fact-check lookups keyed by claim hash (per worker process)
+_inflight_fact_checks: dict[str, asyncio.Task] = {}
+
+# Parsed Google News top stories keyed by (country, max_results)
+_top_news_cache = TTLCache(maxsize=16, ttl=CACHE_TTL_NEWS)
+
 # --- HELPER FUNCTIONS ---
 
-def call_gemini_with_retry(prompt: str, system_prompt: str, max_retries: int = 3):
-    """Call Gemini API with exponential backoff retry logic"""
+async def cache_get(key: str):
+    """Read a JSON value from the cache, or None on miss / cache unavailable"""
+    try:
+        value = await cache.get(key)
+        return orjson.loads(value) if value is not None else None
+    except redis.RedisError:
+        return None
+
+async def cache_set(key: str, value, ttl: int):
+    """Store a JSON value in the cache with a TTL, ignoring cache failures"""
+    try:
+        await cache.setex(key, ttl, orjson.dumps(value))
+    except redis.RedisError:
+        pass
+
+def _error_details(error: Exception):
+    """The structured google.rpc details (RetryInfo, ErrorInfo, ...) of a Gemini error"""
+    details = getattr(error, 'details', None)
+    if isinstance(details, dict):
+        details = details.get('error', details)
+        details = details.get('details', []) if isinstance(details, dict) else []
+    return [detail for detail in details or [] if isinstance(detail, dict)]
+
+def _is_api_key_error(error: genai_errors.ClientError):
+    """Whether a Gemini error means the API key is missing, invalid or not allowed"""
+    if error.code in (401, 403):
+        return True
+    # An invalid key is reported as 400 INVALID_ARGUMENT with reason API_KEY_INVALID
+    return error.code == 400 and error.status == "INVALID_ARGUMENT" and any(
+        detail.get('reason') == "API_KEY_INVALID" for detail in _error_details(error)
+    )
+
+def _retry_delay_from_error(error: Exception):
+    """Extract the server-suggested retry delay (seconds) from a Gemini error, if any"""
+    for detail in _error_details(error):
+        if 'retryDelay' in detail:
+            try:
+                return float(str(detail['retryDelay']).rstrip('s'))
+            except ValueError:
+                return None
+    return None
+
+async def _back_off_gemini(error: genai_errors.ClientError, attempt: int, max_retries: int):
+    """Handle a Gemini error: re-raise anything but a rate limit, otherwise slow the limiter
+    and wait before the next attempt, or raise UpstreamRateLimited once out of retries"""
+    if error.code != 429:
+        raise error
+    
+    gemini_limiter.on_rate_limited()
+    retry_delay = _retry_delay_from_error(error)
+    
+    # Out of retries, or the server wants a longer pause than we hold a request for -
+    # let the caller tell the client when to come back
+    if attempt == max_retries - 1 or (retry_delay or 0) > gemini_limiter.max_wait:
+        raise UpstreamRateLimited("Gemini", retry_delay or 60 / gemini_limiter.rate) from error
+    
+    # Honor the server's retry delay, otherwise jittered exponential backoff: ~2s, 4s, 8s
+    wait_time = retry_delay or random.uniform(0.5, 1.5) * (2 ** attempt) * 2
+    print(f"Rate limit hit. Retrying in {wait_time:.1f} seconds... (Attempt {attempt + 1}/{max_retries})")
+    await asyncio.sleep(wait_time)
+
+async def call_gemini_with_retry(prompt: str, system_prompt: str, max_retries: int = 3):
+    """Call Gemini API, paced by the adaptive limiter, with jittered backoff on rate limits"""
     for attempt in range(max_retries):
+        await gemini_limiter.acquire()
         try:
-            response = client.models.generate_content(
+            response = await client.aio.models.generate_content(
                 model=MODEL_NAME,
                 contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
                 config=types.GenerateContentConfig(system_instruction=system_prompt)
             )
+            gemini_limiter.on_success()
             return response.text
-        except Exception as e:
-            error_msg = str(e)
-            
-            # If it's a rate limit error and not the last attempt, retry
-            if ("429" in error_msg or "Too Many Requests" in error_msg) and attempt < max_retries - 1:
-                wait_time = (2 ** attempt) * 2  # Exponential backoff: 2s, 4s, 8s
-                print(f"Rate limit hit. Retrying in {wait_time} seconds... (Attempt {attempt + 1}/{max_retries})")
-                time.sleep(wait_time)
-                continue
-            
-            # If it's the last attempt or a different error, raise it
-            raise e
+        except genai_errors.ClientError as e:
+            await _back_off_gemini(e, attempt, max_retries)
     
     raise Exception("Max retries exceeded")
 
-def get_trending_topics_with_verdict(country: str = "US", max_results: int = 5):
+async def stream_gemini(prompt: str, system_prompt: str, max_retries: int = 3):
+    """Stream Gemini output text as it is generated; rate limits are retried like
+    call_gemini_with_retry, but only until the first chunk has been sent"""
+    for attempt in range(max_retries):
+        await gemini_limiter.acquire()
+        started = False
+        try:
+            stream = await client.aio.models.generate_content_stream(
+                model=MODEL_NAME,
+                contents=[types.Content(role="user", parts=[types.Part.from_text(text=prompt)])],
+                config=types.GenerateContentConfig(system_instruction=system_prompt)
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    started = True
+                    yield chunk.text
+            gemini_limiter.on_success()
+            return
+        except genai_errors.ClientError as e:
+            if started:
+                if e.code == 429:
+                    gemini_limiter.on_rate_limited()
+                raise
+            await _back_off_gemini(e, attempt, max_retries)
+
+async def _fetch_top_news(country: str, language: str, max_results: int):
+    """Fetch the Google News top stories RSS feed, cached briefly since it changes slowly"""
+    key = (country, language, max_results)
+    news_list = _top_news_cache.get(key)
+    if news_list is None:
+        # Same query GNews built for a country/language pair
+        params = {'hl': language, 'gl': country, 'ceid': f'{country}:{language}'}
+        response = await app.state.http.get(GOOGLE_NEWS_RSS_URL, params=params, timeout=5, follow_redirects=True)
+        response.raise_for_status()
+        feed = await asyncio.to_thread(feedparser.parse, response.content)
+        
+        news_list = [{
+            'title': entry.get('title', ''),
+            'url': entry.get('link', ''),
+            'published date': entry.get('published', ''),
+            'publisher': {'title': entry.get('source', {}).get('title', 'Unknown')}
+        } for entry in feed.entries[:max_results]]
+        _top_news_cache[key] = news_list
+    return news_list
+
+def strip_publisher(title: str, publisher: str):
+    """Drop the " - Publisher" suffix Google News appends to every headline"""
+    suffix = f" - {publisher}"
+    return title[:-len(suffix)] if publisher and title.endswith(suffix) else title
+
+def group_near_duplicates(titles: list):
+    """For each title, return the index of the first earlier title it near-duplicates (or its own)"""
+    seen = []  # (index, word set) of each distinct title so far
+    representatives = []
+    for i, title in enumerate(titles):
+        words = set(normalize_claim(title).split())
+        for index, seen_words in seen:
+            union = words | seen_words
+            if union and len(words & seen_words) / len(union) >= NEAR_DUPLICATE_THRESHOLD:
+                representatives.append(index)
+                break
+        else:
+            seen.append((i, words))
+            representatives.append(i)
+    return representatives
+
+async def get_trending_topics_with_verdict(country: str = "US", language: str = "en", max_results: int = 5):
     """Get trending news with fact-check verdicts"""
+    cache_key = f"trending:{country}:{language}:{max_results}"
+    cached_results = await cache_get(cache_key)
+    if cached_results is not None:
+        return cached_results
+    
     try:
-        google_news = GNews(country=country, max_results=max_results)
-        news_list = google_news.get_top_news()
+        news_list = await _fetch_top_news(country, language, max_results)
+        
+        titles = [item.get('title', '') for item in news_list]
+        
+        if _GOOGLE_FC_ENABLED:
+            # Same story from several outlets only needs one lookup; network-bound, so run them concurrently.
+            # Compare headlines without the publisher suffix, which differs between outlets
+            representatives = group_near_duplicates([
+                strip_publisher(title, item.get('publisher', {}).get('title', ''))
+                for item, title in zip(news_list, titles)
+            ])
+            unique = sorted(set(representatives))
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(get_fact_check_verdict_internal(titles[i])) for i in unique]
+            verdict_by_index = {i: task.result() for i, task in zip(unique, tasks)}
+            verdicts = [verdict_by_index[i] for i in representatives]
+        else:
+            verdicts = [unchecked_verdict()] * len(titles)
         
         results = []
-        for i, item in enumerate(news_list):
-            claim_text = item.get('title', '')
-            
-            # Get verdict for each claim
-            verdict = get_fact_check_verdict_internal(claim_text)
-            
+        for i, (item, claim_text, verdict) in enumerate(zip(news_list, titles, verdicts)):
             results.append({
                 "id": i + 1,
                 "title": claim_text,
@@ -92,161 +423,345 @@ def get_trending_topics_with_verdict(country: str = "US", max_results: int = 5):
                 "fact_check_source": verdict.get('source', 'N/A')
             })
         
+        await cache_set(cache_key, results, CACHE_TTL_SHORT)
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch trends: {str(e)}")
 
-def get_fact_check_verdict_internal(claim_text: str):
+def normalize_claim(text: str):
+    """Normalize claim text so case, punctuation and spacing variants compare equal"""
+    return re.sub(r'\W+', ' ', text.lower()).strip()
+
+def unchecked_verdict():
+    """Verdict for a claim with no existing fact-check"""
+    return {
+        "verdict": "UNCHECKED",
+        "source": "N/A",
+        "summary": "No previous fact-check found"
+    }
+
+async def get_fact_check_verdict_internal(claim_text: str):
     """Internal function to check fact-check verdict"""
+    if not _GOOGLE_FC_ENABLED:
+        return unchecked_verdict()
+    
+    cache_key = "fc:" + hashlib.sha1(normalize_claim(claim_text).encode()).hexdigest()
+    cached_verdict = await cache_get(cache_key)
+    if cached_verdict is not None:
+        return cached_verdict
+    
+    # Concurrent requests for the same claim share a single upstream lookup
+    task = _inflight_fact_checks.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_lookup_fact_check(claim_text, cache_key))
+        _inflight_fact_checks[cache_key] = task
+        task.add_done_callback(lambda _: _inflight_fact_checks.pop(cache_key, None))
+    
+    # Shield so one caller disconnecting doesn't cancel the lookup for the others
+    return await asyncio.shield(task)
+
+async def _lookup_fact_check(claim_text: str, cache_key: str):
+    """Query Google Fact Check for a claim and cache the verdict"""
     try:
-        if GOOGLE_FACT_CHECK_KEY:
-            url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
-            params = {
-                'query': claim_text,
-                'languageCode': 'en',
-                'key': GOOGLE_FACT_CHECK_KEY,
-                'pageSize': 1
+        params = {**FACT_CHECK_BASE_PARAMS, 'query': claim_text}
+        # Bounded so a burst of lookups stays under the Fact Check quota
+        async with fact_check_limiter:
+            response = await app.state.http.get(FACT_CHECK_URL, params=params, timeout=5)
+        
+        if response.status_code == 429:
+            fact_check_limiter.on_rate_limited()
+        elif response.status_code == 200:
+            fact_check_limiter.on_success()
+        
+        if response.status_code != 200:
+            # Upstream failed - fall back to the last known verdict if we have one
+            stale = await cache_get("stale:" + cache_key)
+            return stale if stale is not None else unchecked_verdict()
+        
+        data = orjson.loads(response.content)
+        verdict = unchecked_verdict()
+        if 'claims' in data and len(data['claims']) > 0:
+            claim = data['claims'][0]
+            review = claim.get('claimReview', [{}])[0]
+            verdict = {
+                "verdict": review.get('textualRating', 'UNCHECKED'),
+                "source": review.get('publisher', {}).get('name', 'Unknown'),
+                "summary": claim.get('text', 'No summary available')
             }
-            response = requests.get(url, params=params, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'claims' in data and len(data['claims']) > 0:
-                    claim = data['claims'][0]
-                    review = claim.get('claimReview', [{}])[0]
-                    return {
-                        "verdict": review.get('textualRating', 'UNCHECKED'),
-                        "source": review.get('publisher', {}).get('name', 'Unknown'),
-                        "summary": claim.get('text', 'No summary available')
-                    }
         
-        # Default response if no fact-check found
-        return {
-            "verdict": "UNCHECKED",
-            "source": "N/A",
-            "summary": "No previous fact-check found"
-        }
+        # Most headlines have no fact-check; keep those negatives around longer
+        ttl = CACHE_TTL_NEGATIVE if verdict['verdict'] == 'UNCHECKED' else CACHE_TTL_LONG
+        await cache_set(cache_key, verdict, ttl)
+        await cache_set("stale:" + cache_key, verdict, CACHE_TTL_STALE)
+        return verdict
     except Exception as e:
+        stale = await cache_get("stale:" + cache_key)
+        if stale is not None:
+            return stale
         return {
             "verdict": "ERROR",
             "source": "N/A",
             "summary": f"Error checking: {str(e)}"
         }
 
-def fact_check_with_newsdata(claim: str):
-    """Fact-check using NewsData.io and Gemini AI"""
+async def embed_claim(claim: str):
+    """Embed a claim as a unit vector for semantic cache lookups, or None if embedding fails"""
     try:
-        # Search NewsData.io for related articles
-        articles = []
-        if NEWSDATA_API_KEY:
-            url = "https://newsdata.io/api/1/latest"
-            params = {
-                'apikey': NEWSDATA_API_KEY,
-                'q': claim,
-                'language': 'en',
-                'size': 5
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('status') == 'success' and 'results' in data:
-                    for article in data['results'][:5]:
-                        articles.append({
-                            'title': article.get('title', ''),
-                            'description': article.get('description', ''),
-                            'source': article.get('source_name', ''),
-                            'url': article.get('link', ''),
-                            'pubDate': article.get('pubDate', '')
-                        })
-        
-        # Use Gemini to analyze the claim with the articles
-        try:
-            system_prompt = """You are a professional fact-checker. Analyze the given claim and supporting articles.
-            Provide a verdict (VERIFIED, FALSE, MISLEADING, or NEEDS_REVIEW) and a detailed explanation.
-            Base your analysis only on the provided articles. Be objective and cite sources."""
-            
-            articles_text = "\n\n".join([
-                f"Article {i+1}:\nTitle: {a['title']}\nSource: {a['source']}\nDescription: {a['description']}"
-                for i, a in enumerate(articles)
-            ]) if articles else "No articles found."
-            
-            prompt = f"""Claim to fact-check: "{claim}"
+        response = await client.aio.models.embed_content(
+            model=EMBEDDING_MODEL,
+            contents=claim,
+            config=types.EmbedContentConfig(output_dimensionality=768)
+        )
+    except Exception:
+        return None
+    vector = np.asarray(response.embeddings[0].values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+async def search_newsdata_articles(claim: str):
+    """Search NewsData.io for articles related to a claim"""
+    if not _NEWSDATA_ENABLED:
+        return []
+    
+    articles = []
+    params = {**NEWSDATA_BASE_PARAMS, 'q': claim}
+    response = await app.state.http.get(NEWSDATA_URL, params=params, timeout=10)
+    if response.status_code == 429:
+        retry_after = response.headers.get('Retry-After', '')
+        raise UpstreamRateLimited("NewsData", float(retry_after) if retry_after.isdigit() else 60)
+    if response.status_code == 200:
+        data = orjson.loads(response.content)
+        if data.get('status') == 'success' and 'results' in data:
+            for article in data['results'][:5]:
+                articles.append({
+                    'title': article.get('title', ''),
+                    'description': article.get('description', ''),
+                    'source': article.get('source_name', ''),
+                    'url': article.get('link', ''),
+                    'pubDate': article.get('pubDate', '')
+                })
+    return articles
+
+_format_article = "Article {i}:\nTitle: {title}\nSource: {source}\nDescription: {description}".format
+
+def build_fact_check_prompt(claim: str, articles: list):
+    """Build the Gemini prompt for a claim and its supporting articles"""
+    articles_text = "\n\n".join(
+        _format_article(i=i, title=a['title'], source=a['source'], description=a['description'])
+        for i, a in enumerate(articles, start=1)
+    ) if articles else "No articles found."
+    
+    return f"""Claim to fact-check: "{claim}"
 
 Supporting Articles:
 {articles_text}
 
 Provide your fact-check verdict and explanation."""
 
-            # Use the retry function instead of direct call
-            analysis = call_gemini_with_retry(prompt, system_prompt, max_retries=3)
-            
-        except Exception as gemini_error:
-            # Handle Gemini API errors (rate limits, etc.)
-            error_msg = str(gemini_error)
-            if "429" in error_msg or "Too Many Requests" in error_msg:
-                analysis = "⚠️ AI Analysis temporarily unavailable due to rate limits. Please try again in a few moments.\n\nBased on the articles found, please review the sources manually for now."
-            elif "403" in error_msg or "PERMISSION_DENIED" in error_msg:
-                analysis = "⚠️ AI Analysis unavailable - API key issue. Please check your Gemini API key.\n\nBased on the articles found, please review the sources manually."
-            else:
-                analysis = f"⚠️ AI Analysis unavailable: {error_msg}\n\nBased on the articles found, please review the sources manually."
-        
-        return {
-            "claim": claim,
-            "verdict": "ANALYZED",
-            "analysis": analysis,
-            "supporting_articles": articles,
-            "articles_count": len(articles)
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Fact-check failed: {str(e)}")
+def gemini_unavailable_message(gemini_error: Exception):
+    """User-facing analysis text when Gemini fails (rate limits, etc.)"""
+    client_error = gemini_error if isinstance(gemini_error, genai_errors.ClientError) else None
+    if isinstance(gemini_error, UpstreamRateLimited) or (client_error and client_error.code == 429):
+        return "⚠️ AI Analysis temporarily unavailable due to rate limits. Please try again in a few moments.\n\nBased on the articles found, please review the sources manually for now."
+    elif client_error and _is_api_key_error(client_error):
+        return "⚠️ AI Analysis unavailable - API key issue. Please check your Gemini API key.\n\nBased on the articles found, please review the sources manually."
+    else:
+        return f"⚠️ AI Analysis unavailable: {gemini_error}\n\nBased on the articles found, please review the sources manually."
+
+def rate_limited_error(error: UpstreamRateLimited):
+    """429 response telling the client how long to back off"""
+    retry_after = max(1, math.ceil(error.retry_after))
+    return HTTPException(
+        status_code=429,
+        detail={
+            "code": "agent.rate_limited",
+            "message": f"{error}. Please retry in {retry_after} seconds.",
+            "retry_after": retry_after
+        },
+        headers={"Retry-After": str(retry_after)}
+    )
+
+def with_google_verdict(data: dict, google_verdict: dict):
+    """Attach the Google Fact Check result; an existing fact-check becomes the primary verdict"""
+    data = {**data, "google_fact_check": google_verdict}
+    if google_verdict['verdict'] not in ['UNCHECKED', 'ERROR']:
+        data["primary_verdict"] = google_verdict
+    return data
+
+async def gather_fact_check_sources(claim: str):
+    """First stage of every fact-check endpoint: the Google verdict, NewsData articles and
+    semantic cache lookup, run concurrently. Returns (result, claim_vector); on a cache hit
+    the result already carries its analysis"""
+    google_verdict, articles, claim_vector = await asyncio.gather(
+        get_fact_check_verdict_internal(claim),
+        search_newsdata_articles(claim),
+        embed_claim(claim)
+    )
+    
+    cached_result = analysis_cache.get(claim_vector) if claim_vector is not None else None
+    if cached_result is not None:
+        # Reuse the analysis of a near-duplicate claim, saying which claim it was written for
+        result = {**cached_result, "claim": claim, "cached_from": cached_result["claim"]}
+    else:
+        result = {"claim": claim, "supporting_articles": articles, "articles_count": len(articles)}
+    
+    return with_google_verdict(result, google_verdict), claim_vector
+
+def complete_fact_check(result: dict, claim_vector, analysis: str):
+    """Attach a finished Gemini analysis and cache it for near-duplicate claims"""
+    result = {**result, "verdict": "ANALYZED", "analysis": analysis}
+    if claim_vector is not None:
+        analysis_cache.set(claim_vector, {key: result[key] for key in CACHED_ANALYSIS_FIELDS})
+    return result
+
+async def analyze_fact_check(result: dict, claim_vector):
+    """Second stage: the Gemini analysis. Rate limits raise UpstreamRateLimited; other Gemini
+    failures return the "unavailable" message, which is not cached"""
+    if "analysis" in result:
+        return result
+    
+    try:
+        prompt = build_fact_check_prompt(result['claim'], result['supporting_articles'])
+        analysis = await call_gemini_with_retry(prompt, FACT_CHECK_SYSTEM_PROMPT, max_retries=3)
+    except UpstreamRateLimited:
+        raise
+    except Exception as gemini_error:
+        return {**result, "verdict": "ANALYZED", "analysis": gemini_unavailable_message(gemini_error)}
+    
+    return complete_fact_check(result, claim_vector, analysis)
+
+def fact_check_error(error: Exception):
+    """Payload describing a failed analysis, for SSE error events and failed jobs"""
+    if isinstance(error, UpstreamRateLimited):
+        info = rate_limited_error(error).detail
+        return {"detail": info["message"], "code": info["code"], "retry_after": info["retry_after"]}
+    return {"detail": gemini_unavailable_message(error)}
+
+async def save_job(job_id: str, job: dict):
+    """Store a background job's state in Redis, where every worker can read it"""
+    await cache.setex("job:" + job_id, CACHE_TTL_JOB, orjson.dumps(job))
+
+async def load_job(job_id: str):
+    """Look up a background job's state, or None if unknown / expired"""
+    value = await cache.get("job:" + job_id)
+    return orjson.loads(value) if value is not None else None
+
+async def run_analysis_job(job_id: str, job: dict, claim_vector):
+    """Background task: run the Gemini analysis for a job and store the result"""
+    try:
+        job = {**await analyze_fact_check(job, claim_vector), "status": "complete"}
+    except UpstreamRateLimited as e:
+        job = {**job, "status": "failed", "error": fact_check_error(e)}
+    
+    try:
+        await save_job(job_id, job)
+    except redis.RedisError:
+        pass  # Redis went away mid-job; the poller will see the job expire
+
+def sse_event(event: str, data):
+    """Format a Server-Sent Events frame"""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
 
 # --- API ENDPOINTS ---
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Project Clarion API is running", "status": "healthy"}
 
 @app.get("/api/trending")
-def get_trending():
+async def get_trending():
     """Get top 5 trending news with fact-check verdicts"""
     try:
-        results = get_trending_topics_with_verdict(country="US")
+        results = await get_trending_topics_with_verdict(country="US")
         return {"status": "success", "data": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/fact-check")
-def fact_check(request: FactCheckRequest):
+async def fact_check(request: FactCheckRequest):
     """Fact-check a claim for journalists"""
     try:
-        # First check Google Fact Check API
-        google_verdict = get_fact_check_verdict_internal(request.claim)
+        result, claim_vector = await gather_fact_check_sources(request.claim)
+        result = await analyze_fact_check(result, claim_vector)
+        return {"status": "success", "data": result}
+    except UpstreamRateLimited as e:
+        raise rate_limited_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/fact-check/jobs")
+async def create_fact_check_job(request: FactCheckRequest, background_tasks: BackgroundTasks):
+    """Fact-check a claim, returning sources right away and running the AI analysis in the background"""
+    try:
+        # Jobs are polled from any worker, so they can only live in Redis
+        await cache.ping()
         
-        # If no existing fact-check, use NewsData + Gemini
-        if google_verdict['verdict'] in ['UNCHECKED', 'ERROR']:
-            result = fact_check_with_newsdata(request.claim)
-            return {
-                "status": "success",
-                "data": {
-                    **result,
-                    "google_fact_check": google_verdict
-                }
-            }
+        result, claim_vector = await gather_fact_check_sources(request.claim)
+        
+        job_id = uuid.uuid4().hex
+        if "analysis" in result:
+            job = {**result, "job_id": job_id, "status": "complete"}
+            await save_job(job_id, job)
         else:
-            # Use existing fact-check but also get additional context
-            result = fact_check_with_newsdata(request.claim)
-            return {
-                "status": "success",
-                "data": {
-                    **result,
-                    "google_fact_check": google_verdict,
-                    "primary_verdict": google_verdict
-                }
-            }
+            job = {**result, "job_id": job_id, "status": "pending"}
+            await save_job(job_id, job)
+            background_tasks.add_task(run_analysis_job, job_id, job, claim_vector)
+        return {"status": "success", "data": job}
+    except redis.RedisError:
+        raise HTTPException(status_code=503, detail="Background fact-check jobs need Redis, which is unavailable")
+    except UpstreamRateLimited as e:
+        raise rate_limited_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/fact-check/jobs/{job_id}")
+async def get_fact_check_job(job_id: str):
+    """Poll a background fact-check job; the analysis is included once its status is complete"""
+    try:
+        job = await load_job(job_id)
+    except redis.RedisError:
+        raise HTTPException(status_code=503, detail="Background fact-check jobs need Redis, which is unavailable")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Fact-check job not found or expired")
+    return {"status": "success", "data": job}
+
+@app.post("/api/fact-check/stream")
+async def fact_check_stream(request: FactCheckRequest):
+    """Fact-check a claim as Server-Sent Events: sources first, then the AI analysis as it streams"""
+    # Gather sources before the stream opens so lookup failures get a proper status code
+    try:
+        result, claim_vector = await gather_fact_check_sources(request.claim)
+    except UpstreamRateLimited as e:
+        raise rate_limited_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Fact-check failed: {str(e)}")
+    
+    async def events():
+        yield sse_event("sources", {key: value for key, value in result.items() if key not in ("verdict", "analysis")})
+        
+        # Semantic cache hit - the whole analysis is already known
+        if "analysis" in result:
+            yield sse_event("analysis", {"text": result["analysis"]})
+            yield sse_event("done", {"verdict": result["verdict"]})
+            return
+        
+        chunks = []
+        try:
+            prompt = build_fact_check_prompt(request.claim, result['supporting_articles'])
+            async for text in stream_gemini(prompt, FACT_CHECK_SYSTEM_PROMPT):
+                chunks.append(text)
+                yield sse_event("analysis", {"text": text})
+        except Exception as gemini_error:
+            # Kept apart from "analysis" so clients don't append it to partial output; no "done" follows
+            yield sse_event("error", fact_check_error(gemini_error))
+            return
+        
+        complete_fact_check(result, claim_vector, "".join(chunks))
+        yield sse_event("done", {"verdict": "ANALYZED"})
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # The app is IO-bound and the Gemini quota is split per worker, so a couple of workers is enough
+    workers = int(os.getenv("WEB_CONCURRENCY") or 2)
+    os.environ["WEB_CONCURRENCY"] = str(workers)  # inherited by workers so they split the Gemini quota
+    uvicorn.run("app:app", host="0.0.0.0", port=8000, workers=workers, loop="uvloop", http="httptools")
@@ -3,6 +3,32 @@ import './JournalistChat.css';
 
 const API_URL = 'http://localhost:8000';
 
+// Reads a Server-Sent Events response body, calling onEvent(event, data) for each frame
+async function readEvents(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const frames = buffer.split('\n\n');
+    buffer = frames.pop();
+
+    for (const frame of frames) {
+      let event = 'message';
+      let data = '';
+      for (const line of frame.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      onEvent(event, JSON.parse(data));
+    }
+  }
+}
+
 function JournalistChat() {
   const [claim, setClaim] = useState('');
   const [result, setResult] = useState(null);
@@ -22,7 +48,7 @@ function JournalistChat() {
       setLoading(true);
       setError(null);
 
-      const response = await fetch(`${API_URL}/api/fact-check`, {
+      const response = await fetch(`${API_URL}/api/fact-check/stream`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -30,6 +56,11 @@ function JournalistChat() {
         body: JSON.stringify({ claim: claim.trim() }),
       });
 
+      if (response.status === 429) {
+        const retryAfter = response.headers.get('Retry-After');
+        throw new Error(`⚠️ Rate limit reached. Please wait ${retryAfter ? `${retryAfter} seconds` : 'a moment'} and try again.`);
+      }
+
       if (!response.ok) {
         const errorData = await response.json().catch(() => null);
         const errorMessage = errorData?.detail || `Server error: ${response.status}`;
@@ -43,13 +74,31 @@ function JournalistChat() {
         }
       }
 
-      const data = await response.json();
-      setResult(data.data);
+      // Sources arrive first, then the AI analysis streams in
+      let current = null;
+      await readEvents(response, (event, data) => {
+        if (event === 'sources') {
+          current = { ...data, verdict: 'ANALYZING', analysis: '' };
+        } else if (event === 'analysis') {
+          current = { ...current, analysis: current.analysis + data.text };
+        } else if (event === 'done') {
+          current = { ...current, verdict: data.verdict };
+        } else if (event === 'error') {
+          current = current && { ...current, verdict: 'FAILED' };
+          setResult(current);
+          throw new Error(data.detail);
+        }
+        setResult(current);
+      });
+
+      if (!current || current.verdict !== 'ANALYZED') {
+        throw new Error('Fact-check ended before the analysis was complete');
+      }
       
       // Add to history
       setHistory(prev => [{
         claim: claim.trim(),
-        result: data.data,
+        result: current,
         timestamp: new Date().toLocaleString()
       }, ...prev]);
       
@@ -121,6 +170,11 @@ function JournalistChat() {
               <div className="claim-display">
                 <strong>Claim Analyzed:</strong>
                 <p>{result.claim}</p>
+                {result.cached_from && (
+                  <p className="cached-from">
+                    <em>Analysis reused from a similar claim: "{result.cached_from}"</em>
+                  </p>
+                )}
               </div>
 
               {result.google_fact_check && result.google_fact_check.verdict !== 'UNCHECKED' && (